@@ -1,13 +1,17 @@
 import argparse
+import math
 import numpy as np
 import torch 
 from pprint import pprint
 from scipy.optimize import linear_sum_assignment
+from scipy.spatial import cKDTree
 import point_cloud_utils as pcu
 import os 
+import multiprocessing as mp
 import random
 import glob
 from tqdm import tqdm
+from concurrent.futures import ThreadPoolExecutor
 
 CAT2ID = {
     'car': '02958343',
@@ -29,32 +33,54 @@ def seed_everything(seed):
 
 
 # Borrow from https://github.com/ThibaultGROUEIX/AtlasNet
-def distChamfer(a, b):
-    x, y = a, b
-    _, num_points, _ = x.size()
-    xx = torch.bmm(x, x.transpose(2, 1))
-    yy = torch.bmm(y, y.transpose(2, 1))
-    zz = torch.bmm(x, y.transpose(2, 1))
-    diag_ind = torch.arange(0, num_points).to(a).long()
-    rx = xx[:, diag_ind, diag_ind].unsqueeze(1).expand_as(xx)
-    ry = yy[:, diag_ind, diag_ind].unsqueeze(1).expand_as(yy)
-    P = (rx.transpose(2, 1) + ry - 2 * zz)
-    return P.min(1)[0], P.min(2)[0]
+def distChamfer(a, b, half=False):
+    if half:
+        # Approximate: fp16 halves the traffic of P but rounds the smallest distances
+        a, b = a.half(), b.half()
+    P = torch.cdist(a, b).pow_(2)  # (B, N, M), P[:, i, j] = |a_i - b_j|^2
+    return torch.amin(P, dim=1).float(), torch.amin(P, dim=2).float()
+
+
+def distChamfer_cpu(a, b):
+    """Same outputs as distChamfer, from per-cloud KD-tree queries instead of the (B, N, M) matrix."""
+    a_np = a.detach().cpu().numpy()
+    b_np = b.detach().cpu().numpy()
+    dl, dr = [], []
+    for x, y in zip(a_np, b_np):
+        dl.append(cKDTree(x).query(y, k=1)[0] ** 2)  # nearest a-point for each b-point
+        dr.append(cKDTree(y).query(x, k=1)[0] ** 2)  # nearest b-point for each a-point
+    return torch.from_numpy(np.stack(dl)).to(a), torch.from_numpy(np.stack(dr)).to(a)
 
 
 # Import CUDA version of approximate EMD, from https://github.com/zekunhao1995/pcgan-pytorch/
 try:
     from metrics.StructuralLosses.nn_distance import nn_distance
+    FUSED_CHAMFER_AVAILABLE = True
     def distChamferCUDA(x, y):
         return nn_distance(x, y)
 except:
-    print("distChamferCUDA not available; fall back to slower version.")
-    def distChamferCUDA(x, y):
-        return distChamfer(x, y)
+    try:
+        # Streaming numba kernel, needs numba and a GPU but no compiled extension
+        from metrics.numba_chamfer import numba_fused_chamfer
+        if not torch.cuda.is_available():
+            raise ImportError("The numba Chamfer kernel needs a GPU")
+        print("distChamferCUDA not available; fall back to the numba kernel.")
+        FUSED_CHAMFER_AVAILABLE = True
+        distChamferCUDA = numba_fused_chamfer
+    except ImportError:
+        print("distChamferCUDA not available; fall back to slower version.")
+        FUSED_CHAMFER_AVAILABLE = False
+        if torch.cuda.is_available():
+            def distChamferCUDA(x, y):
+                return distChamfer(x, y)
+        else:
+            def distChamferCUDA(x, y):
+                return distChamfer_cpu(x, y)
 
 try:
     from metrics.StructuralLosses.match_cost import match_cost
-    def emd_approx_cuda(sample, ref):
+    def emd_approx_cuda(sample, ref, half=False):
+        # The extension only runs in fp32, half is accepted for a common signature
         B, N, N_ref = sample.size(0), sample.size(1), ref.size(1)
         assert N == N_ref, "Not sure what would EMD do in this case"
         emd = match_cost(sample, ref)  # (B,)
@@ -62,11 +88,48 @@ try:
         return emd_norm
 except:
     print("emd_approx_cuda not available. Fall back to slower version.")
-    def emd_approx_cuda(sample, ref):
-        return emd_approx(sample, ref)
+    def emd_approx_cuda(sample, ref, half=False):
+        return emd_approx(sample, ref, half)
         
        
-def emd_approx(x, y):
+def sinkhorn_emd(dist, eps=0.01, iters=100, half=False):
+    """Entropic-regularized EMD for a batch of (N, M) cost matrices with uniform marginals.
+    The Sinkhorn updates run on the log-domain potentials so a small eps stays stable.
+    With half the iterations run in fp16, the final cost is always accumulated in fp32.
+    Returns the mean transport cost per point, shape (B,).
+    """
+    bs, npts, mpts = dist.size()
+    log_K = -dist / eps
+    if half:
+        log_K = log_K.half()
+    log_a = -math.log(npts)
+    log_b = -math.log(mpts)
+    f = log_K.new_zeros((bs, npts))
+    g = log_K.new_zeros((bs, mpts))
+    for _ in range(iters):
+        f = log_a - torch.logsumexp(log_K + g.unsqueeze(1), dim=2)
+        g = log_b - torch.logsumexp(log_K + f.unsqueeze(2), dim=1)
+    T = torch.exp(f.float().unsqueeze(2) + log_K.float() + g.float().unsqueeze(1))  # transport plan, sums to 1
+    return (T * dist).sum((1, 2))
+
+
+_lsa_pool = None
+
+
+def _get_lsa_pool():
+    # Forked once and reused, the batch elements are independent assignment problems
+    global _lsa_pool
+    if _lsa_pool is None:
+        _lsa_pool = mp.Pool(os.cpu_count())
+    return _lsa_pool
+
+
+def _lsa_cost(d):
+    r_idx, c_idx = linear_sum_assignment(d)
+    return d[r_idx, c_idx].mean()
+
+
+def emd_approx(x, y, half=False):
     bs, npts, mpts, dim = x.size(0), x.size(1), y.size(1), x.size(2)
     assert npts == mpts, "EMD only works if two point clouds are equal size"
     dim = x.shape[-1]
@@ -74,25 +137,37 @@ def emd_approx(x, y):
     y = y.reshape(bs, 1, mpts, dim)
     dist = (x - y).norm(dim=-1, keepdim=False)  # (bs, npts, mpts)
 
-    emd_lst = []
-    dist_np = dist.cpu().detach().numpy()
-    for i in range(bs):
-        d_i = dist_np[i]
-        r_idx, c_idx = linear_sum_assignment(d_i)
-        emd_i = d_i[r_idx, c_idx].mean()
-        emd_lst.append(emd_i)
+    if dist.is_cuda:
+        return sinkhorn_emd(dist.detach(), half=half)
+
+    dist_np = dist.detach().numpy()
+    if bs > 1:
+        emd_lst = _get_lsa_pool().map(_lsa_cost, list(dist_np))
+    else:
+        emd_lst = [_lsa_cost(dist_np[0])]
     emd = np.stack(emd_lst).reshape(-1)
     emd_torch = torch.from_numpy(emd).to(x)
     return emd_torch
 
 
+def _cd_tile(a, b):
+    dl, dr = distChamferCUDA(a, b)
+    return dl.mean(dim=1) + dr.mean(dim=1)
+
+
+# On PyTorch 2.x let inductor fuse the two means and the add, older versions run eagerly.
+# The last tile of a sweep is usually smaller, so CUDA graphs (reduce-overhead) would keep re-recording.
+if hasattr(torch, 'compile'):
+    _cd_tile = torch.compile(_cd_tile)
+
+
 def EMD_CD(sample_pcs, ref_pcs, batch_size, reduced=True):
     N_sample = sample_pcs.shape[0]
     N_ref = ref_pcs.shape[0]
     assert N_sample == N_ref, "REF:%d SMP:%d" % (N_ref, N_sample)
 
-    cd_lst = []
-    emd_lst = []
+    cd = sample_pcs.new_empty(N_sample)
+    emd = sample_pcs.new_empty(N_sample)
     iterator = range(0, N_sample, batch_size)
 
     for b_start in iterator:
@@ -100,18 +175,13 @@ def EMD_CD(sample_pcs, ref_pcs, batch_size, reduced=True):
         sample_batch = sample_pcs[b_start:b_end]
         ref_batch = ref_pcs[b_start:b_end]
 
-        dl, dr = distChamferCUDA(sample_batch, ref_batch)
-        cd_lst.append(dl.mean(dim=1) + dr.mean(dim=1))
+        cd[b_start:b_end] = _cd_tile(sample_batch, ref_batch)
 
-        emd_batch = emd_approx_cuda(sample_batch, ref_batch)
-        emd_lst.append(emd_batch)
+        emd[b_start:b_end] = emd_approx_cuda(sample_batch, ref_batch)
 
     if reduced:
-        cd = torch.cat(cd_lst).mean()
-        emd = torch.cat(emd_lst).mean()
-    else:
-        cd = torch.cat(cd_lst)
-        emd = torch.cat(emd_lst)
+        cd = cd.mean()
+        emd = emd.mean()
 
     results = {
         'MMD-CD': cd,
@@ -120,47 +190,106 @@ def EMD_CD(sample_pcs, ref_pcs, batch_size, reduced=True):
     return results
 
 
-def _pairwise_EMD_CD_(sample_pcs, ref_pcs, batch_size, compute_emd):
+def chamfer_tile(sample_tile, ref_tile, chunk_size=32, half=False):
+    """Chamfer distance between every (sample, ref) pair of two tiles of point clouds.
+
+    Squared distances are computed with cdist for chunk_size ref points at a time and
+    reduced with a running min, so only an (S*N, R*chunk_size) block is ever alive.
+    With half the blocks are fp16, the running min and the sums stay fp32.
+    Returns an (S, R) tensor.
+    """
+    S, N, dim = sample_tile.size()
+    R, M, _ = ref_tile.size()
+    sample_flat = sample_tile.reshape(S * N, dim)
+    if half:
+        sample_flat = sample_flat.half()
+    dl = sample_tile.new_full((S, N, R), float('inf'))
+    dr_sum = sample_tile.new_zeros((S, R))
+    for k_start in range(0, M, chunk_size):
+        k_end = min(M, k_start + chunk_size)
+        ref_chunk = ref_tile[:, k_start:k_end].reshape(-1, dim).to(sample_flat)
+        P = torch.cdist(sample_flat, ref_chunk).pow_(2).view(S, N, R, k_end - k_start)
+        dl = torch.min(dl, torch.amin(P, dim=3).float())
+        dr_sum += torch.amin(P, dim=1).float().sum(2)
+    return dl.mean(1) + dr_sum / M
+
+
+def chamfer_tile_cuda(sample_tile, ref_tile):
+    """Same as chamfer_tile, but with a single distChamferCUDA call over all S*R pairs of the tile."""
+    S, N, dim = sample_tile.size()
+    R, M, _ = ref_tile.size()
+    sample_exp = sample_tile.unsqueeze(1).expand(-1, R, -1, -1).reshape(-1, N, dim)
+    ref_exp = ref_tile.unsqueeze(0).expand(S, -1, -1, -1).reshape(-1, M, dim)
+    return _cd_tile(sample_exp, ref_exp).view(S, R)
+
+
+def _sample_tile_size(ref_tile_size, n_points, device, chunk_size=32):
+    """Number of samples per tile, so that one tile uses at most a quarter of the free GPU memory.
+    Capped at ref_tile_size, which gives square tiles on large GPUs and on CPU.
+    """
+    if device.type != 'cuda':
+        return ref_tile_size
+    free_mem, _ = torch.cuda.mem_get_info(device)
+    if FUSED_CHAMFER_AVAILABLE:
+        # Expanded sample and ref clouds plus the two distance outputs
+        bytes_per_sample = ref_tile_size * n_points * (3 + 3 + 1 + 1) * 4
+    else:
+        # Running min plus the cdist chunk and its squared copy
+        bytes_per_sample = ref_tile_size * n_points * (1 + 2 * chunk_size) * 4
+    return int(max(1, min(ref_tile_size, free_mem // 4 // bytes_per_sample)))
+
+
+def _pairwise_EMD_CD_(sample_pcs, ref_pcs, batch_size, compute_emd, symmetric=False, half=False):
     N_sample = sample_pcs.shape[0]
     N_ref = ref_pcs.shape[0]
-    all_cd = []
-    all_emd = []
-    iterator = range(N_sample)
+    if symmetric:
+        # Only the upper-triangular tiles are computed and then mirrored
+        assert N_sample == N_ref, "Symmetric distances need the same set on both sides"
+    all_cd = sample_pcs.new_empty((N_sample, N_ref))
+    all_emd = sample_pcs.new_empty((N_sample, N_ref)) if compute_emd else None
+    sample_tile_size = _sample_tile_size(batch_size, sample_pcs.size(1), sample_pcs.device)
+    iterator = range(0, N_sample, sample_tile_size)
+
+    # Chamfer tiles are queued on a side stream so they overlap with the EMD work on the current one
+    cd_stream = None
+    if sample_pcs.is_cuda:
+        cd_stream = torch.cuda.Stream(sample_pcs.device)
+        cd_stream.wait_stream(torch.cuda.current_stream(sample_pcs.device))
 
     for sample_b_start in tqdm(iterator):
-        sample_batch = sample_pcs[sample_b_start]
+        sample_b_end = min(N_sample, sample_b_start + sample_tile_size)
+        sample_batch = sample_pcs[sample_b_start:sample_b_end]
 
-        cd_lst = []
-        emd_lst = []
-        for ref_b_start in range(0, N_ref, batch_size):
+        # In the symmetric case start at the ref tile holding the diagonal entry of this sample tile
+        first_ref = sample_b_start // batch_size * batch_size if symmetric else 0
+        for ref_b_start in range(first_ref, N_ref, batch_size):
             ref_b_end = min(N_ref, ref_b_start + batch_size)
             ref_batch = ref_pcs[ref_b_start:ref_b_end]
 
-            batch_size_ref = ref_batch.size(0)
-            sample_batch_exp = sample_batch.view(1, -1, 3).expand(batch_size_ref, -1, -1)
-            sample_batch_exp = sample_batch_exp.contiguous()
-
-            dl, dr = distChamferCUDA(sample_batch_exp, ref_batch)
-            cd_lst.append((dl.mean(dim=1) + dr.mean(dim=1)).view(1, -1))
+            with torch.cuda.stream(cd_stream):
+                if FUSED_CHAMFER_AVAILABLE:
+                    cd_tile = chamfer_tile_cuda(sample_batch, ref_batch)
+                else:
+                    cd_tile = chamfer_tile(sample_batch, ref_batch, half=half)
+                all_cd[sample_b_start:sample_b_end, ref_b_start:ref_b_end] = cd_tile
 
             if compute_emd:
-                emd_batch = emd_approx_cuda(sample_batch_exp, ref_batch)
-                emd_lst.append(emd_batch.view(1, -1))
-
-        cd_lst = torch.cat(cd_lst, dim=1)
-        all_cd.append(cd_lst)
-
+                # The approximate matching keeps a (B, N, N) buffer, so EMD stays one sample per call
+                batch_size_ref = ref_batch.size(0)
+                for i, sample in enumerate(sample_batch):
+                    sample_exp = sample.view(1, -1, 3).expand(batch_size_ref, -1, -1).contiguous()
+                    all_emd[sample_b_start + i, ref_b_start:ref_b_end] = emd_approx_cuda(sample_exp, ref_batch, half)
+
+    if cd_stream is not None:
+        torch.cuda.current_stream(sample_pcs.device).wait_stream(cd_stream)
+
+    if symmetric:
+        # The distance of a cloud to itself is zero, so the diagonal is dropped as well
+        all_cd = torch.triu(all_cd, diagonal=1)
+        all_cd = all_cd + all_cd.t()
         if compute_emd:
-            emd_lst = torch.cat(emd_lst, dim=1)
-            all_emd.append(emd_lst)
-        
-
-    all_cd = torch.cat(all_cd, dim=0)  # N_sample, N_ref
-    
-    if compute_emd:
-        all_emd = torch.cat(all_emd, dim=0)  # N_sample, N_ref
-    else:
-        all_emd = None
+            all_emd = torch.triu(all_emd, diagonal=1)
+            all_emd = all_emd + all_emd.t()
 
     return all_cd, all_emd
 
@@ -169,17 +298,17 @@ def _pairwise_EMD_CD_(sample_pcs, ref_pcs, batch_size, compute_emd):
 def knn(Mxx, Mxy, Myy, k, sqrt=False):
     n0 = Mxx.size(0)
     n1 = Myy.size(0)
-    label = torch.cat((torch.ones(n0), torch.zeros(n1))).to(Mxx)
+    label = Mxx.new_zeros(n0 + n1)
+    label[:n0] = 1
     M = torch.cat((torch.cat((Mxx, Mxy), 1), torch.cat((Mxy.transpose(0, 1), Myy), 1)), 0)
     if sqrt:
         M = M.abs().sqrt()
-    INFINITY = float('inf')
-    val, idx = (M + torch.diag(INFINITY * torch.ones(n0 + n1).to(Mxx))).topk(k, 0, False)
+    # M is a fresh tensor from torch.cat, so the diagonal can be masked in place
+    M.diagonal().fill_(float('inf'))
+    val, idx = M.topk(k, 0, False)
 
-    count = torch.zeros(n0 + n1).to(Mxx)
-    for i in range(0, k):
-        count = count + label.index_select(0, idx[i])
-    pred = torch.ge(count, (float(k) / 2) * torch.ones(n0 + n1).to(Mxx)).float()
+    count = label[idx].sum(dim=0)
+    pred = (count >= float(k) / 2).float()
 
     s = {
         'tp': (pred * label).sum(),
@@ -204,8 +333,7 @@ def lgan_mmd_cov(all_dist):
     min_val, _ = torch.min(all_dist, dim=0)
     mmd = min_val.mean()
     mmd_smp = min_val_fromsmp.mean()
-    cov = float(min_idx.unique().view(-1).size(0)) / float(N_ref)
-    cov = torch.tensor(cov).to(all_dist)
+    cov = torch.bincount(min_idx, minlength=N_ref).gt(0).sum().to(all_dist) / N_ref
     return {
         'lgan_mmd': mmd,
         'lgan_cov': cov,
@@ -213,34 +341,35 @@ def lgan_mmd_cov(all_dist):
     }
 
 
-def compute_all_metrics(sample_pcs, ref_pcs, batch_size, compute_emd):
+def compute_all_metrics(sample_pcs, ref_pcs, batch_size, compute_emd, half=False):
     results = {}
 
-    M_rs_cd, M_rs_emd = _pairwise_EMD_CD_(ref_pcs, sample_pcs, batch_size, compute_emd=compute_emd)
+    # Rows are samples, so lgan_mmd_cov reduces a contiguous matrix
+    M_sr_cd, M_sr_emd = _pairwise_EMD_CD_(sample_pcs, ref_pcs, batch_size, compute_emd=compute_emd, half=half)
 
-    res_cd = lgan_mmd_cov(M_rs_cd.t())
+    res_cd = lgan_mmd_cov(M_sr_cd)
     results.update({
         "%s-CD" % k: v for k, v in res_cd.items()
     })
 
-    if M_rs_emd is not None:
-        res_emd = lgan_mmd_cov(M_rs_emd.t())
+    if M_sr_emd is not None:
+        res_emd = lgan_mmd_cov(M_sr_emd)
         results.update({
             "%s-EMD" % k: v for k, v in res_emd.items()
         })
 
-    M_rr_cd, M_rr_emd = _pairwise_EMD_CD_(ref_pcs, ref_pcs, batch_size, compute_emd=compute_emd)
-    M_ss_cd, M_ss_emd = _pairwise_EMD_CD_(sample_pcs, sample_pcs, batch_size, compute_emd=compute_emd)
+    M_rr_cd, M_rr_emd = _pairwise_EMD_CD_(ref_pcs, ref_pcs, batch_size, compute_emd=compute_emd, symmetric=True, half=half)
+    M_ss_cd, M_ss_emd = _pairwise_EMD_CD_(sample_pcs, sample_pcs, batch_size, compute_emd=compute_emd, symmetric=True, half=half)
 
     # 1-NN results
-    one_nn_cd_res = knn(M_rr_cd, M_rs_cd, M_ss_cd, 1, sqrt=False)
+    one_nn_cd_res = knn(M_rr_cd, M_sr_cd.t(), M_ss_cd, 1, sqrt=False)
     results.update({
         "1-NN-CD-%s" % k: v for k, v in one_nn_cd_res.items() if 'acc' in k
     })
 
     if M_rr_emd is not None:
 
-        one_nn_emd_res = knn(M_rr_emd, M_rs_emd, M_ss_emd, 1, sqrt=False)
+        one_nn_emd_res = knn(M_rr_emd, M_sr_emd.t(), M_ss_emd, 1, sqrt=False)
         results.update({
             "1-NN-EMD-%s" % k: v for k, v in one_nn_emd_res.items() if 'acc' in k
         })
@@ -261,11 +390,18 @@ def evaluate(args):
         split_models = [model.rstrip() for model in split_models]
 
 
-    ref_pcs = []
-    for model in split_models:
-        data = np.load(os.path.join(args.dataset_path,CAT2ID[args.category], f'{model}.npz'))['vertices']
-        ref_pcs.append(np.random.permutation(data)[:args.n_points,:])
-    ref_pcs = torch.tensor(ref_pcs).cuda().float() # n_models, n_pts, 3
+    def load_ref(model):
+        return np.load(os.path.join(args.dataset_path,CAT2ID[args.category], f'{model}.npz'))['vertices']
+
+    # Files are read by a thread pool, the sampling stays in order on the main thread so the seed
+    # still fixes the result. Sample point indices instead of permuting the (possibly dense) clouds
+    ref_pcs = np.empty((len(split_models), args.n_points, 3), np.float32)
+    with ThreadPoolExecutor(max_workers=16) as ex:
+        for i, data in enumerate(ex.map(load_ref, split_models)):
+            ref_pcs[i] = data[np.random.choice(data.shape[0], args.n_points, replace=False)]
+    # Pinned host memory lets the copy run asynchronously while the generated data is read
+    ref_pcs = torch.from_numpy(ref_pcs).pin_memory()
+    ref_pcs = ref_pcs.to('cuda', non_blocking=True) # n_models, n_pts, 3
 
     # Read in the generated data
 
@@ -273,25 +409,29 @@ def evaluate(args):
     method = args.gen_path.split(os.sep)[-1] if args.gen_path[-1] != os.sep else args.gen_path.split(os.sep)[-2]
     assert method in ['pointflow', 'ours'], "Method not recognized. Implement the eval code"
 
-    gen_pcs = []
-    for model in gen_models:
-        if method in ['pointflow']:
-            v = pcu.load_mesh_v(model)
-            assert v.shape[0] >= args.n_points, "Not enough points were genrated"
-            gen_pcs.append(np.random.permutation(v)[:args.n_points,:])
+    load_gen = pcu.load_mesh_v if method in ['pointflow'] else pcu.load_mesh_vf
 
-        else:
-            v, f = pcu.load_mesh_vf(model)
-            f_idx, bc = pcu.sample_mesh_random(v, f, num_samples=args.n_points)
-            v_sampled = pcu.interpolate_barycentric_coords(f, f_idx, bc, v)
-            gen_pcs.append(v_sampled)
+    gen_pcs = np.empty((len(gen_models), args.n_points, 3), np.float32)
+    with ThreadPoolExecutor(max_workers=16) as ex:
+        for i, mesh in enumerate(ex.map(load_gen, gen_models)):
+            if method in ['pointflow']:
+                v = mesh
+                assert v.shape[0] >= args.n_points, "Not enough points were genrated"
+                gen_pcs[i] = v[np.random.choice(v.shape[0], args.n_points, replace=False)]
+
+            else:
+                v, f = mesh
+                f_idx, bc = pcu.sample_mesh_random(v, f, num_samples=args.n_points)
+                v_sampled = pcu.interpolate_barycentric_coords(f, f_idx, bc, v)
+                gen_pcs[i] = v_sampled
 
-    gen_pcs = torch.tensor(gen_pcs).cuda().float()
+    gen_pcs = torch.from_numpy(gen_pcs).pin_memory()
+    gen_pcs = gen_pcs.to('cuda', non_blocking=True)
 
     assert ref_pcs.shape[0] == gen_pcs.shape[0], "The number of generated models does not correspond the test set size"
 
     # Compute metrics
-    results = compute_all_metrics(gen_pcs, ref_pcs, args.batch_size, args.compute_emd)
+    results = compute_all_metrics(gen_pcs, ref_pcs, args.batch_size, args.compute_emd, args.half)
     results = {k: (v.cpu().detach().item()
                     if not isinstance(v, float) else v) for k, v in results.items()}
     pprint(results)
@@ -307,6 +447,7 @@ if __name__ == "__main__":
     parser.add_argument("--n_points", type=int, default=2048, help="Number of points used for evaluation")
     parser.add_argument("--batch_size", type=int, default=50, help="batch size")
     parser.add_argument("--compute_emd", action='store_true', help="If selected EMD metrics will be computed as well")
+    parser.add_argument("--half", action='store_true', help="Approximate the fallback distance matrices in fp16 (faster, less precise)")
     args = parser.parse_args()
 
     evaluate(args)
@@ -9,16 +9,9 @@ from scipy.optimize import linear_sum_assignment
 
 # Borrow from https://github.com/ThibaultGROUEIX/AtlasNet
 def distChamfer(a, b):
-    x, y = a, b
-    bs, num_points, points_dim = x.size()
-    xx = torch.bmm(x, x.transpose(2, 1))
-    yy = torch.bmm(y, y.transpose(2, 1))
-    zz = torch.bmm(x, y.transpose(2, 1))
-    diag_ind = torch.arange(0, num_points).to(a).long()
-    rx = xx[:, diag_ind, diag_ind].unsqueeze(1).expand_as(xx)
-    ry = yy[:, diag_ind, diag_ind].unsqueeze(1).expand_as(yy)
-    P = (rx.transpose(2, 1) + ry - 2 * zz)
-    return P.min(1)[0], P.min(2)[0]
+    # cdist picks the matmul or the direct kernel depending on the problem size
+    P = torch.cdist(a, b).pow_(2)  # (B, N, M), P[:, i, j] = |a_i - b_j|^2
+    return torch.amin(P, dim=1), torch.amin(P, dim=2)
 
 # Import CUDA version of approximate EMD, from https://github.com/zekunhao1995/pcgan-pytorch/
 try:
@@ -110,14 +103,12 @@ def _pairwise_EMD_CD_(sample_pcs, ref_pcs, batch_size, accelerated_cd=True,
                       accelerated_emd=True):
     N_sample = sample_pcs.shape[0]
     N_ref = ref_pcs.shape[0]
-    all_cd = []
-    all_emd = []
+    all_cd = sample_pcs.new_empty((N_sample, N_ref))
+    all_emd = sample_pcs.new_empty((N_sample, N_ref))
     iterator = range(N_sample)
     for sample_b_start in iterator:
         sample_batch = sample_pcs[sample_b_start]
 
-        cd_lst = []
-        emd_lst = []
         for ref_b_start in range(0, N_ref, batch_size):
             ref_b_end = min(N_ref, ref_b_start + batch_size)
             ref_batch = ref_pcs[ref_b_start:ref_b_end]
@@ -130,23 +121,15 @@ def _pairwise_EMD_CD_(sample_pcs, ref_pcs, batch_size, accelerated_cd=True,
                 dl, dr = distChamferCUDA(sample_batch_exp, ref_batch)
             else:
                 dl, dr = distChamfer(sample_batch_exp, ref_batch)
-            cd_lst.append((dl.mean(dim=1) + dr.mean(dim=1)).view(1, -1))
+            all_cd[sample_b_start, ref_b_start:ref_b_end] = dl.mean(dim=1) + dr.mean(dim=1)
 
             if accelerated_emd:
                 emd_batch = emd_approx_cuda(sample_batch_exp, ref_batch)
             else:
                 emd_batch = emd_approx(sample_batch_exp, ref_batch)
-            emd_lst.append(emd_batch.view(1, -1))
+            all_emd[sample_b_start, ref_b_start:ref_b_end] = emd_batch
 
-        cd_lst = torch.cat(cd_lst, dim=1)
-        emd_lst = torch.cat(emd_lst, dim=1)
-        all_cd.append(cd_lst)
-        all_emd.append(emd_lst)
-
-    all_cd = torch.cat(all_cd, dim=0)  # N_sample, N_ref
-    all_emd = torch.cat(all_emd, dim=0)  # N_sample, N_ref
-
-    return all_cd, all_emd
+    return all_cd, all_emd  # N_sample, N_ref
 
 
 # Adapted from https://github.com/xuqiantong/GAN-Metrics/blob/master/framework/metric.py
@@ -0,0 +1,76 @@
+import math
+import torch
+from numba import cuda, float32
+
+# Points of x handled per block (one per thread) and points of y staged in shared memory per step
+TILE_N = 32
+TILE_M = 32
+
+
+@cuda.jit
+def _nn_dist_kernel(x, y, out):
+    '''
+    input:
+        x : batch_size * #x_points * 3
+        y : batch_size * #y_points * 3
+    output:
+        out : batch_size * #x_points, squared distance to the nearest point of y
+    '''
+    tid = cuda.threadIdx.x
+    i = cuda.blockIdx.x * TILE_N + tid
+    b = cuda.blockIdx.y
+    n = x.shape[1]
+    m = y.shape[1]
+
+    y_tile = cuda.shared.array(shape=(TILE_M, 3), dtype=float32)
+
+    px = float32(0.)
+    py = float32(0.)
+    pz = float32(0.)
+    if i < n:
+        px = x[b, i, 0]
+        py = x[b, i, 1]
+        pz = x[b, i, 2]
+    min_val = float32(math.inf)
+
+    for j_start in range(0, m, TILE_M):
+        for t in range(tid, TILE_M, TILE_N):
+            if j_start + t < m:
+                y_tile[t, 0] = y[b, j_start + t, 0]
+                y_tile[t, 1] = y[b, j_start + t, 1]
+                y_tile[t, 2] = y[b, j_start + t, 2]
+        cuda.syncthreads()
+
+        for t in range(min(TILE_M, m - j_start)):
+            dx = px - y_tile[t, 0]
+            dy = py - y_tile[t, 1]
+            dz = pz - y_tile[t, 2]
+            d = dx * dx + dy * dy + dz * dz
+            if d < min_val:
+                min_val = d
+        cuda.syncthreads()
+
+    if i < n:
+        out[b, i] = min_val
+
+
+def _nn_dist(x, y, out, stream):
+    grid = (math.ceil(x.size(1) / TILE_N), x.size(0))
+    _nn_dist_kernel[grid, TILE_N, stream](
+        cuda.as_cuda_array(x), cuda.as_cuda_array(y), cuda.as_cuda_array(out))
+
+
+def numba_fused_chamfer(x, y):
+    """Drop-in for the nn_distance extension: returns the squared nearest-neighbour distances
+    (B, N) from x to y and (B, M) from y to x without building the (B, N, M) distance matrix.
+    Forward only, which is all the evaluation metrics need.
+    """
+    x = x.detach().float().contiguous()
+    y = y.detach().float().contiguous()
+    dl = x.new_empty((x.size(0), x.size(1)))
+    dr = x.new_empty((y.size(0), y.size(1)))
+    # Launch on PyTorch's current stream so the kernels are ordered with the surrounding ops
+    stream = cuda.external_stream(torch.cuda.current_stream(x.device).cuda_stream)
+    _nn_dist(x, y, dl, stream)
+    _nn_dist(y, x, dr, stream)
+    return dl, dr